@@ -20,17 +20,20 @@ import urllib.parse
 import requests
 import logging
 import shutil
-from torchvision import transforms
-from torch.utils.data import DataLoader, random_split
+from torch.utils.data import DataLoader, TensorDataset, random_split
 import pytorch_lightning as pl
 from typing import Optional
 from torchvision.datasets import MNIST
 
 class MNISTDataModule(pl.LightningDataModule):
-    def __init__(self, data_url: str, data_dir: str = '/tmp/det', batch_size=64):
+    def __init__(self, data_url: str, data_dir: str = '/tmp/det', batch_size=64,
+                 num_workers: int = 0):
         super().__init__()
         self.data_dir = data_dir
         self.batch_size = batch_size
+        # Samples are slices of a pre-normalized tensor (see setup), so loading needs
+        # no worker processes by default.
+        self.num_workers = num_workers
         self.data_url = data_url
         # self.dims is returned when you call dm.size()
         # Setting default dims here because we know them.
@@ -59,21 +62,29 @@ class MNISTDataModule(pl.LightningDataModule):
 
         self.data_dir = os.path.dirname(download_directory)
 
-    def setup(self, stage: Optional[str] = None):
-        transform = transforms.Compose([transforms.ToTensor(),
-                                        transforms.Normalize((0.1307,), (0.3081,))])
+    @staticmethod
+    def normalized_dataset(mnist: MNIST) -> TensorDataset:
+        # Equivalent to ToTensor + Normalize((0.1307,), (0.3081,)), applied to the whole
+        # split in one vectorized pass instead of per sample in __getitem__.
+        images = (mnist.data.float() / 255.0 - 0.1307) / 0.3081
+        return TensorDataset(images.unsqueeze(1), mnist.targets)
 
+    def setup(self, stage: Optional[str] = None):
         # Assign train/val datasets for use in dataloaders
         if stage == 'fit' or stage is None:
-            mnist_full = MNIST(self.data_dir, train=True, transform=transform)
+            mnist_full = self.normalized_dataset(MNIST(self.data_dir, train=True))
             self.mnist_train, self.mnist_val = random_split(mnist_full, [55000, 5000])
 
         # Assign test dataset for use in dataloader(s)
         if stage == 'test' or stage is None:
-            self.mnist_test = MNIST(self.data_dir, train=False, transform=transform)
+            self.mnist_test = self.normalized_dataset(MNIST(self.data_dir, train=False))
 
 
     def train_dataloader(self):
-        return DataLoader(self.mnist_train, batch_size=self.batch_size)
+        return DataLoader(self.mnist_train, batch_size=self.batch_size,
+                          num_workers=self.num_workers, pin_memory=True,
+                          persistent_workers=self.num_workers > 0)
     def val_dataloader(self):
-        return DataLoader(self.mnist_val, batch_size=self.batch_size)
+        return DataLoader(self.mnist_val, batch_size=self.batch_size,
+                          num_workers=self.num_workers, pin_memory=True,
+                          persistent_workers=self.num_workers > 0)
@@ -15,7 +15,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from collections import OrderedDict
+import contextlib
 
 import numpy as np
 import torch
@@ -36,7 +36,9 @@ class Generator(nn.Module):
         def block(in_feat, out_feat, normalize=True):
             layers = [nn.Linear(in_feat, out_feat)]
             if normalize:
-                layers.append(nn.BatchNorm1d(out_feat, 0.8))
+                # LayerNorm normalizes each sample on its own, so unlike BatchNorm1d it has no
+                # running statistics and behaves the same regardless of the per-slot batch size.
+                layers.append(nn.LayerNorm(out_feat))
             layers.append(nn.LeakyReLU(0.2, inplace=True))
             return layers
 
@@ -65,11 +67,10 @@ class Discriminator(nn.Module):
             nn.Linear(512, 256),
             nn.LeakyReLU(0.2, inplace=True),
             nn.Linear(256, 1),
-            nn.Sigmoid(),
         )
 
     def forward(self, img):
-        img_flat = img.view(img.size(0), -1)
+        img_flat = img.flatten(1)
         validity = self.model(img_flat)
 
         return validity
@@ -78,10 +79,10 @@ class Discriminator(nn.Module):
 """### C. GAN
 #### A couple of cool features to check out in this example...
 
-  - We use `some_tensor.type_as(another_tensor)` to make sure we initialize new tensors on the right device (i.e. GPU, CPU).
+  - We register tensors that we create ourselves as buffers so that they follow the model to the right device (i.e. GPU, CPU).
     - Lightning will put your dataloader data on the right device automatically
-    - In this example, we pull from latent dim on the fly, so we need to dynamically add tensors to the right device.
-    - `type_as` is the way we recommend to do this.
+    - In this example, we pull from latent dim on the fly, so we sample the noise in place into a buffer that already lives on the model's device.
+    - This avoids creating tensors on the CPU and copying them over with `type_as` on every step.
   - This example shows how to use multiple dataloaders in your `LightningModule`.
 """
 class GAN(pl.LightningModule):
@@ -106,82 +107,127 @@ class GAN(pl.LightningModule):
         self.generator = Generator(latent_dim=self.hparams.latent_dim, img_shape=data_shape)
         self.discriminator = Discriminator(img_shape=data_shape)
 
-        self.validation_z = torch.randn(8, self.hparams.latent_dim)
+        # Compile the networks in place where supported (PyTorch 2.2+) so that elementwise ops
+        # are fused into fewer kernels. Compiling in place keeps state_dict keys unchanged.
+        if hasattr(nn.Module, 'compile'):
+            self.generator.compile(fullgraph=True)
+            self.discriminator.compile(fullgraph=True)
+
+        # Labels and noise are preallocated once and sliced to the batch size in each step,
+        # rather than allocated on the CPU and copied to the device every step.
+        self.register_buffer(
+            'validation_z', torch.randn(8, self.hparams.latent_dim), persistent=False)
+        self.register_buffer('valid_labels', torch.ones(batch_size, 1), persistent=False)
+        self.register_buffer('fake_labels', torch.zeros(batch_size, 1), persistent=False)
+        self.register_buffer('noise', torch.empty(batch_size, latent_dim), persistent=False)
 
         self.example_input_array = torch.zeros(2, self.hparams.latent_dim)
 
     def forward(self, z):
         return self.generator(z)
 
-    def adversarial_loss(self, y_hat, y):
-        return F.binary_cross_entropy(y_hat, y)
+    def check_batch_size(self, batch_size):
+        max_batch_size = self.valid_labels.size(0)
+        assert batch_size <= max_batch_size, (
+            f'got a batch of {batch_size} samples, but the label and noise buffers are sized for '
+            f'the batch_size hyperparameter ({max_batch_size}); pass a larger batch_size to GAN'
+        )
 
-    def training_step(self, batch, batch_idx, optimizer_idx):
+    def adversarial_loss(self, y_hat, y):
+        # The discriminator outputs logits; the fused sigmoid + BCE is numerically stable.
+        return F.binary_cross_entropy_with_logits(y_hat, y)
+
+    def autocast(self):
+        # BF16 keeps FP32's exponent range, so unlike FP16 it needs no GradScaler.
+        # Fall back to full precision where BF16 autocast is unavailable
+        # (PyTorch < 1.10 or GPUs without BF16 tensor cores).
+        if (
+            self.device.type == 'cuda'
+            and hasattr(torch, 'autocast')
+            and torch.cuda.is_bf16_supported()
+        ):
+            return torch.autocast(device_type='cuda', dtype=torch.bfloat16)
+        return contextlib.nullcontext()
+
+    # CHANGE optimize manually so that both optimizers share one generator forward pass
+    @property
+    def automatic_optimization(self) -> bool:
+        return False
+
+    def training_step(self, batch, batch_idx):
         imgs, _ = batch
+        batch_size = imgs.size(0)
+        self.check_batch_size(batch_size)
+        opt_g, opt_d = self.optimizers()
 
         # sample noise
-        z = torch.randn(imgs.shape[0], self.hparams.latent_dim)
-        z = z.type_as(imgs)
+        z = torch.randn(batch_size, self.hparams.latent_dim, out=self.noise[:batch_size])
 
-        # train generator
-        if optimizer_idx == 0:
+        # ground truth results
+        valid = self.valid_labels[:batch_size]
+        fake = self.fake_labels[:batch_size]
 
-            # generate images
+        # generate images
+        with self.autocast():
             self.generated_imgs = self(z)
 
-            # CHANGE remove logger
-            # log sampled images
-            sample_imgs = self.generated_imgs[:6]
-            grid = torchvision.utils.make_grid(sample_imgs)
-            # self.logger.experiment.add_image('generated_images', grid, 0)
-
-            # ground truth result (ie: all fake)
-            # put on GPU because we created this tensor inside training_loop
-            valid = torch.ones(imgs.size(0), 1)
-            valid = valid.type_as(imgs)
-
-            # adversarial loss is binary cross-entropy
-            g_loss = self.adversarial_loss(self.discriminator(self(z)), valid)
-            tqdm_dict = {'g_loss': g_loss}
-            output = OrderedDict({
-                'loss': g_loss,
-                # 'progress_bar': tqdm_dict, # not valid in PyTorchTrial
-                # 'log': tqdm_dict,
-            })
-            return output
-
         # train discriminator
-        if optimizer_idx == 1:
-            # Measure discriminator's ability to classify real from generated samples
-
-            # how well can it label as real?
-            valid = torch.ones(imgs.size(0), 1)
-            valid = valid.type_as(imgs)
+        # Measure discriminator's ability to classify real from generated samples, scoring
+        # both in a single forward pass over the concatenated batch.
+        with self.autocast():
+            validity = self.discriminator(torch.cat([imgs, self.generated_imgs.detach()]))
+        real_validity, fake_validity = validity.float().split(batch_size)
 
-            real_loss = self.adversarial_loss(self.discriminator(imgs), valid)
+        real_loss = self.adversarial_loss(real_validity, valid)
+        fake_loss = self.adversarial_loss(fake_validity, fake)
 
-            # how well can it label as fake?
-            fake = torch.zeros(imgs.size(0), 1)
-            fake = fake.type_as(imgs)
+        # discriminator loss is the average of these
+        d_loss = (real_loss + fake_loss) / 2
+        self.manual_backward(d_loss, opt_d)
+        opt_d.step()
+        opt_d.zero_grad()
 
-            fake_loss = self.adversarial_loss(
-                self.discriminator(self(z).detach()), fake)
-
-            # discriminator loss is the average of these
-            d_loss = (real_loss + fake_loss) / 2
-            tqdm_dict = {'d_loss': d_loss}
-            output = OrderedDict({
-                'loss': d_loss,
-                # 'progress_bar': tqdm_dict,
-                # 'log': tqdm_dict
-            })
-            return output
+        # train generator
+        # Only the generator's parameters may receive gradients from the generator loss.
+        self.toggle_optimizer(opt_g, 0)
+        with self.autocast():
+            validity = self.discriminator(self.generated_imgs)
+
+        # adversarial loss is binary cross-entropy
+        g_loss = self.adversarial_loss(validity.float(), valid)
+        self.manual_backward(g_loss, opt_g)
+        opt_g.step()
+        opt_g.zero_grad()
+        self.untoggle_optimizer(0)
+
+        return {'g_loss': g_loss, 'd_loss': d_loss}
+
+    # CHANGE log sampled images outside of training_step, and only when there is a logger;
+    # LightningAdapter does not provide one
+    def on_train_batch_end(self, outputs, batch, batch_idx, *args, **kwargs):
+        # building the grid is CPU-bound, so only do it periodically
+        if self.logger is None or batch_idx % 100 != 0 or self.global_step == 0:
+            return
+        sample_imgs = self.generated_imgs[:6].detach().float()
+        grid = torchvision.utils.make_grid(sample_imgs)
+        self.logger.experiment.add_image('generated_images', grid, self.global_step)
+
+    # CHANGE sample images at the end of validation rather than in on_epoch_end
+    def on_validation_epoch_end(self):
+        if self.logger is None:
+            return
+        # log sampled images
+        with torch.no_grad():
+            sample_imgs = self(self.validation_z).float()
+        grid = torchvision.utils.make_grid(sample_imgs)
+        self.logger.experiment.add_image('validation_images', grid, self.current_epoch)
 
     # CHANGE add validation step
     def validation_step(self, batch, batch_idx, *args, **kwargs):
         imgs, _ = batch
-        valid = torch.ones(imgs.size(0), 1, device=self.device)
-        loss = F.binary_cross_entropy(self.discriminator(imgs), valid)
+        self.check_batch_size(imgs.size(0))
+        valid = self.valid_labels[:imgs.size(0)]
+        loss = self.adversarial_loss(self.discriminator(imgs), valid)
         return {'loss': loss}
 
     def configure_optimizers(self):
@@ -27,9 +27,11 @@ class GANTrial(LightningAdapter):
     def build_training_data_loader(self) -> DataLoader:
         self.dm.setup()
         dl = self.dm.train_dataloader()
-        return DataLoader(dl.dataset, batch_size=dl.batch_size, num_workers=dl.num_workers)
+        return DataLoader(dl.dataset, batch_size=dl.batch_size, num_workers=dl.num_workers,
+                          pin_memory=dl.pin_memory, persistent_workers=dl.persistent_workers)
 
     def build_validation_data_loader(self) -> DataLoader:
         self.dm.setup()
         dl = self.dm.val_dataloader()
-        return DataLoader(dl.dataset, batch_size=dl.batch_size, num_workers=dl.num_workers)
+        return DataLoader(dl.dataset, batch_size=dl.batch_size, num_workers=dl.num_workers,
+                          pin_memory=dl.pin_memory, persistent_workers=dl.persistent_workers)
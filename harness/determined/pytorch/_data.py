@@ -85,6 +85,10 @@ class DataLoader:
         worker_init_fn (callable, optional): If not ``None``, this will be called on each
             worker subprocess with the worker id (an int in ``[0, num_workers - 1]``) as
             input, after seeding and before data loading. (default: ``None``)
+        persistent_workers (bool, optional): If ``True``, the data loader will not shutdown
+            the worker processes after a dataset has been consumed once. This allows to
+            maintain the workers `Dataset` instances alive. Requires PyTorch 1.7 or greater.
+            (default: ``False``)
     """
 
     def __init__(
@@ -100,6 +104,7 @@ class DataLoader:
         drop_last: bool = False,
         timeout: float = 0,
         worker_init_fn: _worker_init_fn_t = None,
+        persistent_workers: bool = False,
     ):
 
         # BEGIN VENDORED CODE FROM PYTORCH
@@ -113,11 +118,15 @@ class DataLoader:
         if timeout < 0:
             raise ValueError("timeout option should be non-negative")
 
+        if persistent_workers and num_workers == 0:
+            raise ValueError("persistent_workers option needs num_workers > 0")
+
         self.dataset = dataset
         self.num_workers = num_workers
         self.pin_memory = pin_memory
         self.timeout = timeout
         self.worker_init_fn = worker_init_fn
+        self.persistent_workers = persistent_workers
 
         # TODO(DET-1524): uncomment this as we do not currently support IterableDataset
         # if isinstance(dataset, IterableDataset):
@@ -195,6 +204,11 @@ class DataLoader:
         batch_sampler = adapt_batch_sampler(
             batch_sampler, repeat=repeat, skip=skip, num_replicas=num_replicas, rank=rank
         )
+        # Only pass persistent_workers when it is set, since PyTorch < 1.7 does not accept it.
+        extra_kwargs = {}  # type: Dict[str, Any]
+        if self.persistent_workers:
+            extra_kwargs["persistent_workers"] = True
+
         return torch.utils.data.DataLoader(
             self.dataset,
             batch_sampler=batch_sampler,
@@ -203,6 +217,7 @@ class DataLoader:
             pin_memory=self.pin_memory,
             timeout=self.timeout,
             worker_init_fn=self.worker_init_fn,  # type: ignore
+            **extra_kwargs,
         )
 
     def __iter__(self) -> Iterator:
@@ -383,7 +398,8 @@ def to_device(
     """
     Accept np.ndarray, torch.Tensor, list, or dictionary. Recursively convert any ndarrays to
     tensors and call .to() on any tensors or data types that have custom serialization logic
-    defined via a callable to() attribute.
+    defined via a callable to() attribute. Tensors are copied with ``non_blocking=True``, so
+    batches from a ``DataLoader`` with ``pin_memory=True`` are transferred asynchronously.
 
     If the data cannot be moved to device, log a warning (only once per type) and return the
     original data.
@@ -404,6 +420,9 @@ def to_device(
         # Do not attempt to convert any other kinds to tensors.
         if data.dtype.kind in "fciub":
             return torch.from_numpy(data).to(device)
+    elif isinstance(data, torch.Tensor):
+        # Copies from pinned memory (DataLoader(pin_memory=True)) overlap with compute.
+        return data.to(device, non_blocking=True)
     elif hasattr(data, "to") and callable(data.to):  # type: ignore
         return data.to(device)  # type: ignore
 
@@ -1,6 +1,5 @@
-import inspect
 from abc import abstractmethod
-from typing import Any, Dict, List, Sequence, Tuple, Union, cast
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union, cast
 
 import pytorch_lightning as pl
 import torch
@@ -12,7 +11,6 @@ from typing_extensions import Literal
 
 from determined.common import check
 from determined.errors import InvalidModelException
-from determined.monkey_patch import monkey_patch
 from determined.pytorch import (
     DataLoader,
     LRScheduler,
@@ -55,17 +53,36 @@ def check_compatibility(lm: pl.LightningModule) -> None:
         "validation_step_end",
     }
 
-    members = inspect.getmembers(lm, predicate=inspect.ismethod)
-    overridden_members = set(
-        map(lambda m: m[0], filter(lambda m: is_overridden(m[0], lm), members))
-    )
+    # Hooks that LightningAdapter calls into.
+    supported_members = {
+        "configure_optimizers",
+        "on_after_backward",
+        "on_before_zero_grad",
+        "on_load_checkpoint",
+        "on_save_checkpoint",
+        "on_train_batch_end",
+        "on_train_batch_start",
+        "on_train_epoch_start",
+        "on_validation_batch_end",
+        "on_validation_batch_start",
+        "on_validation_epoch_end",
+        "on_validation_epoch_start",
+        "toggle_optimizer",
+        "training_step",
+        "untoggle_optimizer",
+        "validation_epoch_end",
+        "validation_step",
+    }
 
-    matches = unsupported_members & overridden_members
+    # Only check the hooks we know about rather than reflecting over every member of lm.
+    matches = {m for m in unsupported_members if is_overridden(m, lm)}
     if len(matches) > 0:
         raise InvalidModelException(prefix + f"{matches}")
 
-    for member in overridden_members:
-        if has_param(getattr(lm, member), "dataloader_idx"):
+    # Only the hooks LightningAdapter calls are checked for `dataloader_idx`; hooks in neither
+    # set (e.g. on_epoch_end) are accepted but never called.
+    for member in sorted(supported_members):
+        if is_overridden(member, lm) and has_param(getattr(lm, member), "dataloader_idx"):
             raise InvalidModelException(
                 prefix
                 + f'multiple dataloaders and `dataloader_idx` are not supported in "{member}"'
@@ -102,6 +119,41 @@ def override_unsupported_nud(lm: pl.LightningModule, context: PyTorchTrialContex
     lm.log_dict = lm_log_dict  # type: ignore
 
 
+class _ManualOptimizer:
+    """
+    Wraps an optimizer handed to a LightningModule that uses manual optimization, so that
+    ``optimizer.step()`` goes through ``context.step_optimizer`` (AMP, distributed training and
+    gradient aggregation) and ``optimizer.zero_grad()`` calls ``on_before_zero_grad`` like the
+    automatic optimization path does.
+    """
+
+    def __init__(self, context: PyTorchTrialContext, lm: pl.LightningModule, optimizer: Optimizer):
+        self._context = context
+        self._lm = lm
+        self._optimizer = optimizer
+
+    def step(self, closure: Optional[Callable[[], Any]] = None, **kwargs: Any) -> Any:
+        if len(kwargs) != 0:
+            raise InvalidModelException(
+                f"unsupported arguments to optimizer.step in manual optimization {kwargs}"
+            )
+
+        loss = None
+        if closure is not None:
+            with torch.enable_grad():
+                loss = closure()
+
+        self._context.step_optimizer(self._optimizer, auto_zero_grads=False)
+        return loss
+
+    def zero_grad(self, *args: Any, **kwargs: Any) -> None:
+        self._lm.on_before_zero_grad(self._optimizer)
+        self._optimizer.zero_grad(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._optimizer, name)
+
+
 class _LightningAdapterState:
     def __init__(
         self,
@@ -184,6 +236,12 @@ class LightningAdapter(PyTorchTrial):
         self._pls = pls
         pls.optimizers, pls.lr_schedulers = self.setup_optimizers_schedulers()
 
+        # Inspecting the training_step signature is slow; decide once how to call it.
+        self._automatic_optimization = getattr(pls.lm, "automatic_optimization", True)
+        self._num_optimizers = len(pls.optimizers)
+        self._training_step_has_optimizer_idx = has_param(pls.lm.training_step, "optimizer_idx")
+        self._opt_prefixes = [f"opt{opt_idx}_" for opt_idx in range(self._num_optimizers)]
+
         if precision == 16 and amp_backend == "apex":
             context.configure_apex_amp(
                 context.models,
@@ -204,6 +262,27 @@ class LightningAdapter(PyTorchTrial):
         pls.lm.use_amp = use_amp
         pls.lm.precision = "mixed" if use_amp else precision  # type: ignore
 
+        # LightningModule.optimizers and manual_backward depend on a Trainer. Patch them once
+        # here rather than around every use in train_batch.
+        lm_optimizers: Union[List[Optimizer], List[_ManualOptimizer], _ManualOptimizer]
+        lm_optimizers = pls.optimizers
+        if not self._automatic_optimization:
+            # training_step drives the optimizers itself, so route optimizer.step() through
+            # Determined. Like LightningModule.optimizers, return a single optimizer unwrapped.
+            manual_optimizers = [_ManualOptimizer(context, pls.lm, opt) for opt in pls.optimizers]
+            lm_optimizers = manual_optimizers
+            if len(manual_optimizers) == 1:
+                lm_optimizers = manual_optimizers[0]
+
+        def lm_manual_backward(
+            loss: torch.Tensor, optimizer: Any = None, *args: Any, **kwargs: Any
+        ) -> None:
+            context.backward(loss, *args, **kwargs)
+            pls.lm.on_after_backward()
+
+        pls.lm.optimizers = lambda *args, **kwargs: lm_optimizers  # type: ignore
+        pls.lm.manual_backward = lm_manual_backward  # type: ignore
+
     def build_callbacks(self) -> Dict[str, PyTorchCallback]:
         """
         build_callbacks defines a set of necessary PyTorchTrialCallback to support
@@ -316,18 +395,30 @@ class LightningAdapter(PyTorchTrial):
         # taken from pytorch_lightning
         args = [batch, batch_idx]
 
-        if len(self._pls.optimizers) > 1:
-            if has_param(self._pls.lm.training_step, "optimizer_idx"):
+        if self._num_optimizers > 1:
+            if self._training_step_has_optimizer_idx:
                 args.append(opt_idx)
             else:
-                num_opts = len(self._pls.optimizers)
                 raise InvalidModelException(
-                    f"Your LightningModule defines {num_opts} optimizers but "
+                    f"Your LightningModule defines {self._num_optimizers} optimizers but "
                     f'training_step is missing the "optimizer_idx" argument.'
                 )
 
         return args
 
+    def _manual_train_batch(self, batch: TorchData, batch_idx: int) -> Dict[str, Any]:
+        # With automatic_optimization disabled, training_step drives the optimizers itself
+        # through manual_backward, optimizer.step and optimizer.zero_grad.
+        metrics = self._pls.lm.training_step(batch, batch_idx)  # type: ignore
+
+        if metrics is None:
+            metrics = {}
+        elif not isinstance(metrics, dict):
+            metrics = {"loss": metrics}
+
+        self._pls.lm.on_train_batch_end(metrics, batch, batch_idx, dataloader_idx=0)
+        return metrics
+
     def train_batch(
         self, batch: TorchData, epoch_idx: int, batch_idx: int
     ) -> Union[torch.Tensor, Dict[str, Any]]:
@@ -339,16 +430,16 @@ class LightningAdapter(PyTorchTrial):
         type(self._pls.lm).global_step = batch_idx  # type: ignore
         self._pls.lm.on_train_batch_start(batch, batch_idx, dataloader_idx=0)
 
+        if not self._automatic_optimization:
+            return self._manual_train_batch(batch, batch_idx)
+
         Metric = Dict[str, Any]
 
         opt_metrics: List[Metric] = []
         metrics: Metric = {}
 
         for opt_idx, opt in enumerate(self._pls.optimizers):
-            with monkey_patch(
-                self._pls.lm, "optimizers", lambda *args, **kwargs: self._pls.optimizers
-            ):
-                self._pls.lm.toggle_optimizer(opt, opt_idx)
+            self._pls.lm.toggle_optimizer(opt, opt_idx)
             train_args = self._build_train_args(batch, batch_idx, opt_idx)
             metrics = self._pls.lm.training_step(*train_args)  # type: ignore
 
@@ -364,13 +455,14 @@ class LightningAdapter(PyTorchTrial):
             opt.zero_grad()
 
             opt_metrics.append(metrics)
-            with monkey_patch(
-                self._pls.lm, "optimizers", lambda *args, **kwargs: self._pls.optimizers
-            ):
-                self._pls.lm.untoggle_optimizer(opt_idx)
+            self._pls.lm.untoggle_optimizer(opt_idx)
 
         self._pls.lm.on_train_batch_end(metrics, batch, batch_idx, dataloader_idx=0)
 
+        # with a single set of metrics there are no duplicate names to account for
+        if len(opt_metrics) <= 1:
+            return opt_metrics[0] if opt_metrics else {}
+
         # report metrics accounting for duplicate metric names
         # across multiple optimizers
         metric_names: List[str] = []
@@ -382,7 +474,7 @@ class LightningAdapter(PyTorchTrial):
         for opt_idx, opt_metric_dict in enumerate(opt_metrics):
             for m_name, m_value in opt_metric_dict.items():
                 if m_name in duplicate_metrics:
-                    m_name = f"opt{opt_idx}_{m_name}"
+                    m_name = self._opt_prefixes[opt_idx] + m_name
                 agg_metrics[m_name] = m_value
         return agg_metrics
 
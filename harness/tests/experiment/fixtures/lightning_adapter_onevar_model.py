@@ -71,6 +71,63 @@ class OneVarLM(pl.LightningModule):
         return {"val_loss": loss}
 
 
+class OneVarManualLM(OneVarLM):
+    @property
+    def automatic_optimization(self) -> bool:
+        return False
+
+    def training_step(self, batch, batch_idx, *args, **kwargs):
+        data, label = batch
+        opt = self.optimizers()
+
+        # Measure the weight and learning rate right now.
+        w_before = self.model.weight.data.item()
+        lr = opt.param_groups[0]["lr"]
+
+        # Calculate expected values for the weight after the step.
+        w_exp = w_before + 2 * lr * data[0] * (label[0] - (data[0] * w_before))
+
+        loss = self.loss_fn(self.model(data), label)
+        self.manual_backward(loss, opt)
+        opt.step()
+        opt.zero_grad()
+
+        w_after = self.model.weight.data.item()
+        assert abs(w_after - w_exp.item()) < 0.000001, f"{w_after} does not match {w_exp}"
+
+        return {"loss": loss, "w_before": w_before, "w_after": w_after}
+
+
+class OneVarManualClosureLM(OneVarLM):
+    @property
+    def automatic_optimization(self) -> bool:
+        return False
+
+    def training_step(self, batch, batch_idx, *args, **kwargs):
+        data, label = batch
+        opt = self.optimizers()
+
+        # Measure the weight and learning rate right now.
+        w_before = self.model.weight.data.item()
+        lr = opt.param_groups[0]["lr"]
+
+        # Calculate expected values for the weight after the step.
+        w_exp = w_before + 2 * lr * data[0] * (label[0] - (data[0] * w_before))
+
+        def closure():
+            loss = self.loss_fn(self.model(data), label)
+            self.manual_backward(loss, opt)
+            return loss
+
+        loss = opt.step(closure=closure)
+        opt.zero_grad(set_to_none=True)
+
+        w_after = self.model.weight.data.item()
+        assert abs(w_after - w_exp.item()) < 0.000001, f"{w_after} does not match {w_exp}"
+
+        return {"loss": loss, "w_before": w_before, "w_after": w_after}
+
+
 class OneDatasetLDM(pl.LightningDataModule):
     def __init__(self, batch_size: int = 32, *args, **kwargs):
         self.batch_size = batch_size
@@ -122,6 +122,14 @@ def test_pytorch_batch_sampler_mutual_exclusion():
     assert dataloader.get_data_loader() is not None
 
 
+def test_pytorch_persistent_workers():
+    with pytest.raises(ValueError):
+        det.pytorch.DataLoader(make_dataset(), persistent_workers=True)
+
+    dataloader = det.pytorch.DataLoader(make_dataset(), num_workers=1, persistent_workers=True)
+    assert dataloader.get_data_loader().persistent_workers
+
+
 def make_input(inp: typing.List) -> typing.Iterator[typing.Tuple]:
     return zip(inp, [length for _ in range(len(inp))])
 
@@ -166,6 +174,40 @@ def test_to_device() -> None:
     assert np.array_equal(to_device(np.array([0, 1, 2]), "cpu"), np.array([0, 1, 2]))
 
 
+def test_to_device_tensors() -> None:
+    """
+    Tensors are copied with non_blocking=True; check that nested batches still arrive on the
+    target device with their values intact, including from pinned memory when CUDA is available.
+    """
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    pinned = torch.arange(4.0)
+    if torch.cuda.is_available():
+        pinned = pinned.pin_memory()
+
+    data_structure = {
+        "pinned": pinned,
+        "list": [torch.ones(2), (torch.zeros(3), torch.arange(2))],
+        "tuple": (torch.tensor([[1.0, 2.0], [3.0, 4.0]]),),
+    }
+    moved = to_device(data_structure, device)
+
+    assert isinstance(moved, dict)
+    assert isinstance(moved["list"], list)
+    assert isinstance(moved["list"][1], tuple)
+    assert isinstance(moved["tuple"], tuple)
+
+    expected = [
+        (data_structure["pinned"], moved["pinned"]),
+        (data_structure["list"][0], moved["list"][0]),
+        (data_structure["list"][1][0], moved["list"][1][0]),
+        (data_structure["list"][1][1], moved["list"][1][1]),
+        (data_structure["tuple"][0], moved["tuple"][0]),
+    ]
+    for original, result in expected:
+        assert result.device.type == device.type
+        assert torch.equal(result.cpu(), original)
+
+
 @pytest.mark.parametrize("dedup_between_calls", [True, False])
 def test_to_device_warnings(dedup_between_calls) -> None:
     queue = multiprocessing.Queue()
@@ -5,11 +5,41 @@ from typing import Any, Dict
 import pytest
 
 import determined as det
-from determined import workload
+from determined import errors, workload
+from determined.pytorch.lightning._adapter import check_compatibility
 from tests.experiment import utils  # noqa: I100
 from tests.experiment.fixtures import lightning_adapter_onevar_model as la_model
 
 
+def test_check_compatibility_unsupported_hook() -> None:
+    class OneVarLM(la_model.OneVarLM):
+        def test_step(self, batch, batch_idx):
+            pass
+
+    with pytest.raises(errors.InvalidModelException, match="test_step"):
+        check_compatibility(OneVarLM())
+
+
+def test_check_compatibility_dataloader_idx() -> None:
+    class ValidationStepLM(la_model.OneVarLM):
+        def validation_step(self, batch, batch_idx, dataloader_idx):
+            pass
+
+    class TrainBatchEndLM(la_model.OneVarLM):
+        def on_train_batch_end(self, outputs, batch, batch_idx, dataloader_idx):
+            pass
+
+    with pytest.raises(errors.InvalidModelException, match="validation_step"):
+        check_compatibility(ValidationStepLM())
+
+    with pytest.raises(errors.InvalidModelException, match="on_train_batch_end"):
+        check_compatibility(TrainBatchEndLM())
+
+
+def test_check_compatibility_supported() -> None:
+    check_compatibility(la_model.OneVarLM())
+
+
 class TestLightningAdapter:
     def setup_method(self) -> None:
         # This training setup is not guaranteed to converge in general,
@@ -85,6 +115,80 @@ class TestLightningAdapter:
         with pytest.raises(AssertionError):
             utils.checkpointing_and_restoring_test(make_trial_controller_fn, tmp_path)
 
+    def test_manual_optimization(self) -> None:
+        class OneVarLA(la_model.OneVarTrial):
+            def __init__(self, context):
+                super().__init__(context, la_model.OneVarManualLM)
+
+        def make_trial_controller_fn(
+            workloads: workload.Stream, load_path: typing.Optional[str] = None
+        ) -> det.TrialController:
+
+            return utils.make_trial_controller_from_trial_implementation(
+                trial_class=OneVarLA,
+                hparams=self.hparams,
+                workloads=workloads,
+                load_path=load_path,
+                trial_seed=self.trial_seed,
+            )
+
+        utils.train_and_validate(make_trial_controller_fn)
+
+    def test_manual_optimization_closure(self) -> None:
+        class OneVarLA(la_model.OneVarTrial):
+            def __init__(self, context):
+                super().__init__(context, la_model.OneVarManualClosureLM)
+
+        def make_trial_controller_fn(
+            workloads: workload.Stream, load_path: typing.Optional[str] = None
+        ) -> det.TrialController:
+
+            return utils.make_trial_controller_from_trial_implementation(
+                trial_class=OneVarLA,
+                hparams=self.hparams,
+                workloads=workloads,
+                load_path=load_path,
+                trial_seed=self.trial_seed,
+            )
+
+        utils.train_and_validate(make_trial_controller_fn)
+
+    def test_manual_optimization_hooks(self) -> None:
+        class OneVarLM(la_model.OneVarManualLM):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.hook_calls = []
+
+            def on_after_backward(self):
+                self.hook_calls.append("on_after_backward")
+
+            def on_before_zero_grad(self, optimizer):
+                self.hook_calls.append("on_before_zero_grad")
+
+            def training_step(self, *args, **kwargs):
+                self.hook_calls = []
+                metrics = super().training_step(*args, **kwargs)
+                assert self.hook_calls == ["on_after_backward", "on_before_zero_grad"]
+                return metrics
+
+        class OneVarLA(la_model.OneVarTrial):
+            def __init__(self, context):
+                super().__init__(context, OneVarLM)
+
+        def make_trial_controller_fn(
+            workloads: workload.Stream, load_path: typing.Optional[str] = None
+        ) -> det.TrialController:
+
+            return utils.make_trial_controller_from_trial_implementation(
+                trial_class=OneVarLA,
+                hparams=self.hparams,
+                workloads=workloads,
+                load_path=load_path,
+                trial_seed=self.trial_seed,
+            )
+
+        utils.train_and_validate(make_trial_controller_fn)
+
     def test_lr_scheduler(self, tmp_path: pathlib.Path) -> None:
         class OneVarLAFreq1(la_model.OneVarTrialLRScheduler):
             def check_lr_value(self, batch_idx: int):